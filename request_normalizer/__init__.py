@@ -5,4 +5,5 @@ from .request_normalizer import (
     normalize_headers,
     normalize_request,
     normalize_url,
+    normalize_url_cached,
 )
@@ -4,8 +4,7 @@
 # TODO: url-normalize/issues/19
 # TODO: url-normalize/issues/25
 # TODO: url-normalize/issues/31
-# TODO: LRU cache for most CPU-intensive functions
-#   * IDNA encoding
+# TODO: LRU cache for other CPU-intensive functions
 #   * handling missing scheme?
 #   * need to benchmark to discover others
 #   * Note: urlsplit has its own internal cache
@@ -13,8 +12,20 @@ import json
 import re
 import unicodedata
 from dataclasses import dataclass
-from typing import Iterable, List, Mapping, MutableMapping, Optional, Tuple, Union
-from urllib.parse import parse_qsl, quote, unquote, urlsplit, urlunsplit
+from functools import lru_cache
+from typing import (
+    AbstractSet,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
+from urllib.parse import unquote, unquote_plus, urlsplit, urlunsplit
 
 import idna
 
@@ -22,10 +33,22 @@ KVList = Iterable[Tuple[str, str]]
 ParamList = Optional[Iterable[str]]
 Headers = MutableMapping[str, str]
 
-AUTH_PATTERN = re.compile(r'([^@]*@)?([^:]*):?(.*)')
+SCHEME_PATTERN = re.compile(r'[A-Za-z][A-Za-z0-9+.-]*')
+# Patterns used to detect input that is already normalized, so it can skip the full pipeline
+CANONICAL_URL_PATTERN = re.compile(
+    r'(https?)://([a-z0-9.-]+)(?::([1-9][0-9]*))?(/[A-Za-z0-9_.~!$&\'()*+,/:;=@-]*)'
+)
+CANONICAL_QUERY_PATTERN = re.compile(r"[A-Za-z0-9_.~!$&'()*,/:=?@\[\]-]*")
 DEFAULT_CHARSET = 'utf-8'
 DEFAULT_SCHEME = 'https'
 DEFAULT_SAFE_CHARS = "!#$%&'()*+,/:;=?@[]~"
+FORM_CONTENT_TYPE = 'application/x-www-form-urlencoded'
+JSON_CONTENT_TYPE = 'application/json'
+HOST_CACHE_SIZE = 4096
+URL_CACHE_SIZE = 16384
+VALUE_CACHE_SIZE = 4096
+VALUE_CACHE_MAX_LENGTH = 256
+REDACTED = 'REDACTED'
 
 # Default port numbers for a subset of common protocols. Sources:
 #   * https://github.com/python-hyper/hyperlink
@@ -55,10 +78,15 @@ DEFAULT_PORTS = {
     'wss': '443',
 }
 PORT_LOOKUP = {v: k for k, v in reversed(list(DEFAULT_PORTS.items()))}
+# Schemes for which path normalization is applied
+PATH_SCHEMES = frozenset(['', 'http', 'https', 'ftp', 'file'])
+_EMPTY_FROZENSET: FrozenSet[str] = frozenset()
 
 
 @dataclass
 class URL:
+    # Note: dataclass(slots=True) requires python 3.10+
+    __slots__ = ('scheme', 'userinfo', 'host', 'port', 'path', 'query', 'fragment')
     scheme: str
     userinfo: str
     host: str
@@ -70,8 +98,12 @@ class URL:
     @classmethod
     def from_string(cls, url: str, default_scheme: str = DEFAULT_SCHEME) -> 'URL':
         """Parse a URL string into its components"""
-        scheme, netloc, path, query, fragment = urlsplit(url)
-        (userinfo, host, port) = AUTH_PATTERN.search(netloc).groups()  # type: ignore
+        # Fall back to urlsplit for less common URL formats
+        scheme, netloc, path, query, fragment = _split_url(url) or urlsplit(url)
+        # Split netloc into 'userinfo@', host, and port
+        at = netloc.find('@')
+        userinfo = netloc[: at + 1]
+        host, _, port = netloc[at + 1 :].partition(':')
         return cls(
             fragment=fragment,
             host=host,
@@ -79,7 +111,7 @@ class URL:
             port=port,
             query=query,
             scheme=scheme,
-            userinfo=userinfo or '',
+            userinfo=userinfo,
         )
 
     def to_string(self) -> str:
@@ -87,7 +119,18 @@ class URL:
         auth = self.userinfo + self.host
         if self.port:
             auth = f'{auth}:{self.port}'
-        return urlunsplit((self.scheme, auth, self.path, self.query, self.fragment))
+        # URLs without a netloc are less common, and their handling varies by python version
+        if not auth:
+            return urlunsplit((self.scheme, auth, self.path, self.query, self.fragment))
+
+        # Otherwise, skip urlunsplit() argument coercion and tuple handling
+        path = self.path if not self.path or self.path[0] == '/' else f'/{self.path}'
+        url = f'{self.scheme}://{auth}{path}' if self.scheme else f'//{auth}{path}'
+        if self.query:
+            url = f'{url}?{self.query}'
+        if self.fragment:
+            url = f'{url}#{self.fragment}'
+        return url
 
 
 # TODO: finalize param names and behavior
@@ -119,8 +162,9 @@ def normalize_request(
     Returns:
         Normalized and filtered request URL, headers, and body
     """
+    ignore_params = frozenset(ignore_params) if ignore_params else None
     return (
-        normalize_url(
+        normalize_url_cached(
             url or '', charset, default_scheme, ignore_params, sort_params, redact_ignored
         ),
         normalize_headers(headers, ignore_params, redact_ignored),
@@ -136,9 +180,11 @@ def normalize_headers(
         return {}
     headers = dict(sorted(_filter_mapping(headers.items(), ignore_params, redact_ignored)))
     for k, v in headers.items():
-        if ',' in v:
-            values = [v.strip() for v in v.lower().split(',') if v.strip()]
-            headers[k] = ', '.join(sorted(values))
+        # Most headers are single-value, so skip those first
+        if ',' not in v:
+            continue
+        values = sorted(filter(None, (value.strip() for value in v.lower().split(','))))
+        headers[k] = ', '.join(values)
     return headers
     # return CaseInsensitiveDict(headers)
 
@@ -152,15 +198,16 @@ def normalize_body(
     """Normalize and filter a request body if possible, depending on Content-Type"""
     if not body:
         return b''
-    content_type = (headers or {}).get('Content-Type')
-
-    # Filter and sort params if possible
-    if content_type == 'application/json':
-        filtered_body = normalize_json_body(body, ignore_params, redact_ignored)
-    elif content_type == 'application/x-www-form-urlencoded':
-        filtered_body = normalize_query(body, ignore_params, redact_ignored)
+    # Ignore any parameters like charset
+    content_type = (headers or {}).get('Content-Type') or ''
+    content_type = content_type.split(';', 1)[0].strip().lower()
 
-    return _encode(filtered_body)
+    # Filter and sort params if possible; otherwise, leave the body as-is
+    if content_type == JSON_CONTENT_TYPE:
+        return _encode(normalize_json_body(body, ignore_params, redact_ignored))
+    elif content_type == FORM_CONTENT_TYPE:
+        return _encode(normalize_query(body, ignore_params, redact_ignored=redact_ignored))
+    return _encode(body)
 
 
 def normalize_json_body(
@@ -171,7 +218,8 @@ def normalize_json_body(
         return original_body
 
     try:
-        body = json.loads(_decode(original_body))
+        # Note: json.loads() accepts bytes directly, so they don't need to be decoded first
+        body = json.loads(original_body)
         if isinstance(body, Mapping):
             body = dict(sorted(_filter_mapping(body.items(), ignore_params, redact_ignored)))
         else:
@@ -208,42 +256,70 @@ def normalize_url(
     Returns:
         Normalized URL
     """
-    if not url:
+    if not url or _is_normalized_url(url):
         return url
     url = url.strip().rstrip('&?')
     url = provide_url_scheme(url, default_scheme)
     url_parts = URL.from_string(url, default_scheme)
 
+    # Optional components are usually empty, so only normalize them if present
     url_parts.scheme = url_parts.scheme.lower()
-    url_parts.userinfo = normalize_userinfo(url_parts.userinfo)
+    if url_parts.userinfo:
+        url_parts.userinfo = normalize_userinfo(url_parts.userinfo)
     url_parts.host = normalize_host(url_parts.host, charset)
-    url_parts.query = normalize_query(url_parts.query, ignore_params, sort_params, redact_ignored)
-    url_parts.fragment = _requote(url_parts.fragment, safe='~!/')
-    url_parts.port = normalize_port(url_parts.port, url_parts.scheme)
+    if url_parts.query:
+        url_parts.query = normalize_query(
+            url_parts.query, ignore_params, sort_params, redact_ignored
+        )
+    if url_parts.fragment:
+        url_parts.fragment = _requote_cached(url_parts.fragment, safe='~!/')
+    if url_parts.port:
+        url_parts.port = normalize_port(url_parts.port, url_parts.scheme)
     url_parts.path = normalize_path(url_parts.path, url_parts.scheme)
 
     return url_parts.to_string()
 
 
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def normalize_url_cached(
+    url: str,
+    charset: str = DEFAULT_CHARSET,
+    default_scheme: str = DEFAULT_SCHEME,
+    ignore_params: Optional[Union[Tuple[str, ...], FrozenSet[str]]] = None,
+    sort_params: bool = True,
+    redact_ignored: bool = False,
+) -> str:
+    """Same as :py:func:`normalize_url`, but with results cached in a bounded LRU cache.
+    ``ignore_params`` must be hashable (for example, a tuple or frozenset).
+    """
+    return normalize_url(url, charset, default_scheme, ignore_params, sort_params, redact_ignored)
+
+
 def provide_url_scheme(url: str, default_scheme: str = DEFAULT_SCHEME) -> str:
     """Update a URL if it does not contain a valid scheme."""
-    has_scheme = ':' in url[:7]  # TODO: This doesn't seem sufficient
-    is_universal_scheme = url.startswith('//')
-    is_file_path = url == '-' or (url.startswith('/') and not is_universal_scheme)
-
     # Alternative:
     # First check for 'scheme://netloc' (fast), then for less common 'scheme:netloc' (~200ns slower)
     # SCHEME_PATTERN = re.compile(r'^[a-zA-Z][a-zA-Z0-9+.-]*:')
     # elif '://' in url or SCHEME_PATTERN.match(url):
     #     return url
 
-    if not url or has_scheme or is_file_path:
+    # Check for an existing scheme first, since that's the most common case
+    has_scheme = url.find(':', 0, 7) != -1  # TODO: This doesn't seem sufficient
+    if not url or has_scheme or url == '-':
+        return url
+    is_universal_scheme = url[:2] == '//'
+    is_file_path = url[0] == '/' and not is_universal_scheme
+    if is_file_path:
         return url
 
     # Handle a tricky case that urlsplit doesn't parse correctly: URL with known port but no scheme
-    parts = url.replace('//', '').split('/')[0].split(':')
-    if len(parts) >= 2:
-        port = parts[-1]
+    netloc_start = 2 if is_universal_scheme else 0
+    netloc_end = url.find('/', netloc_start)
+    if netloc_end == -1:
+        netloc_end = len(url)
+    port_start = url.rfind(':', netloc_start, netloc_end)
+    if port_start != -1:
+        port = url[port_start + 1 : netloc_end]
         default_scheme = PORT_LOOKUP.get(port, default_scheme)
 
     sep = '' if is_universal_scheme else '//'
@@ -252,15 +328,16 @@ def provide_url_scheme(url: str, default_scheme: str = DEFAULT_SCHEME) -> str:
 
 def normalize_userinfo(userinfo: str) -> str:
     """Normalize userinfo part of the url"""
-    return '' if userinfo in ['@', ':@'] else userinfo
+    return '' if userinfo in ('@', ':@') else userinfo
 
 
+@lru_cache(maxsize=HOST_CACHE_SIZE)
 def normalize_host(host: str, charset: str = DEFAULT_CHARSET) -> str:
     """Normalize host part of the url: Lowercase, strip off final dot, and encode IDN domains."""
     host = host.lower()
     host = host.strip('.')
-    # Skip IDN normalization for URIs that do not contain a domain name
-    if '.' in host:
+    # Skip IDN normalization for URIs that do not contain a domain name, or that are already ASCII
+    if '.' in host and not _is_ascii_hostname(host):
         host = idna.encode(host, uts46=True, transitional=True).decode(charset)
     return host
 
@@ -269,7 +346,8 @@ def normalize_port(port: str, scheme: str) -> str:
     """Normalize URL port: remove default port number, and strip leading zeroes."""
     if not port.isdigit():
         return port
-    port = str(int(port))
+    # Fast path for ASCII digits; int() also converts other Unicode digits to ASCII
+    port = (port.lstrip('0') or '0') if port.isascii() else str(int(port))
     if DEFAULT_PORTS.get(scheme) == port:
         port = ''
     return port
@@ -277,31 +355,17 @@ def normalize_port(port: str, scheme: str) -> str:
 
 def normalize_path(path: str, scheme: str) -> str:
     """Normalize path part of the url. Remove mention of default path number."""
-    if scheme not in ['', 'http', 'https', 'ftp', 'file']:
+    if scheme not in PATH_SCHEMES:
         return path
 
     # Only perform percent-encoding where it is essential.
     # Always use uppercase A-through-F characters when percent-encoding.
     # All portions of the URI must be utf-8 encoded NFC from Unicode strings
-    path = _requote(path)
+    path = _requote_cached(path)
 
     # Prevent dot-segments appearing in non-relative URI paths.
-    output: List[str] = []
-    part = None
-    parts = path.split('/')
-    last_idx = len(parts) - 1
-    for idx, part in enumerate(parts):
-        if part == '':
-            if len(output) == 0:
-                output.append(part)
-        elif part == '..':
-            if len(output) > 1:
-                output.pop()
-        elif part != '.' and not (idx < last_idx and re.search(r'\.', part)):
-            output.append(part)
-    if part in ['', '.', '..']:
-        output.append('')
-    path = '/'.join(output)
+    if _has_dot_segments(path):
+        path = _remove_dot_segments(path)
 
     # For schemes that define an empty path to be equivalent to a path of '/', use '/'.
     if scheme and not path:
@@ -316,27 +380,27 @@ def normalize_query(
     redact_ignored: bool = False,
 ) -> str:
     """Normalize and filter urlencoded params from either a URL or request body with form data."""
-    query = _decode(query)
-    query_dict = [(_requote(k), _requote(v)) for k, v in parse_qsl(query)]
-    filtered_query = [
-        f'{k}={v}' for k, v in _filter_mapping(query_dict, ignore_params, redact_ignored)
-    ]
-
-    # parse_qsl doesn't handle key-only params, so add those here
-    key_only_params = [_requote(k) for k in query.split('&') if k and '=' not in k]
-    filtered_query += _filter_list(key_only_params, ignore_params, redact_ignored)
+    if not query:
+        return ''
+    if isinstance(query, bytes):
+        query = query.decode(DEFAULT_CHARSET)
+
+    # Skip parsing and requoting if the query only contains non-empty params with safe characters
+    if not ignore_params and CANONICAL_QUERY_PATTERN.fullmatch(query):
+        params = query.split('&')
+        if all(p and p[-1] != '=' for p in params):
+            if sort_params:
+                params.sort()
+                return '&'.join(params)
+            key_only_params = [p for p in params if '=' not in p]
+            return '&'.join([p for p in params if '=' in p] + key_only_params)
+
+    filtered_query = _filter_query(query, ignore_params, redact_ignored)
     if sort_params:
-        filtered_query = sorted(filtered_query)
+        filtered_query.sort()
     return '&'.join(filtered_query)
 
 
-def _decode(value: Union[str, bytes], encoding: str = 'utf-8') -> str:
-    """Decode a value from bytes, if hasn't already been"""
-    if not value:
-        return ''
-    return value.decode(encoding) if isinstance(value, bytes) else value
-
-
 def _encode(value: Union[str, bytes], encoding: str = 'utf-8') -> bytes:
     """Encode a value to bytes, if it hasn't already been"""
     if not value:
@@ -348,22 +412,160 @@ def _filter_mapping(
     data: KVList, ignore_params: ParamList = None, redact_ignored: bool = False
 ) -> KVList:
     """Remove or redact ignored keys from a list of key-value pairs"""
-    ignore_params = set(ignore_params or [])
+    if not ignore_params:
+        return data
+    ignore_params = _to_set(ignore_params)
     if redact_ignored:
-        return [(k, 'REDACTED' if k in ignore_params else v) for k, v in data]
+        return [(k, REDACTED if k in ignore_params else v) for k, v in data]
     else:
         return [(k, v) for k, v in data if k not in ignore_params]
 
 
 def _filter_list(data: List, ignore_params: ParamList = None, redact_ignored: bool = False) -> List:
     """Remove or redact ignored keys from a list"""
-    ignore_params = set(ignore_params or [])
+    if not ignore_params:
+        return data
+    ignore_params = _to_set(ignore_params)
     if redact_ignored:
-        return [('REDACTED' if k in ignore_params else k) for k in data]
+        return [(REDACTED if k in ignore_params else k) for k in data]
     else:
         return [k for k in data if k not in ignore_params]
 
 
+def _filter_query(
+    query: str, ignore_params: ParamList = None, redact_ignored: bool = False
+) -> List[str]:
+    """Split, requote, and filter query params, with key-only params last"""
+    # Key-value params are unquoted the same way as parse_qsl(), which skips params with
+    # empty values
+    ignore_params = _to_set(ignore_params) if ignore_params else _EMPTY_FROZENSET
+    filtered_query = []
+    key_only_params = []
+    for param in query.split('&'):
+        key, sep, value = param.partition('=')
+        if value:
+            key = _requote_cached(unquote_plus(key))
+            if key not in ignore_params:
+                filtered_query.append(f'{key}={_requote_cached(unquote_plus(value))}')
+            elif redact_ignored:
+                filtered_query.append(f'{key}={REDACTED}')
+        elif key and not sep:
+            key = _requote_cached(key)
+            if key not in ignore_params:
+                key_only_params.append(key)
+            elif redact_ignored:
+                key_only_params.append(REDACTED)
+
+    filtered_query += key_only_params
+    return filtered_query
+
+
+def _to_set(values: Iterable[str]) -> AbstractSet[str]:
+    """Convert values to a set for fast membership checks, if not already a set"""
+    return values if isinstance(values, AbstractSet) else frozenset(values)
+
+
+def _split_url(url: str) -> Optional[Tuple[str, str, str, str, str]]:
+    """Split a URL in the common format ``scheme://netloc/path?query#fragment`` into components.
+    This gives the same results as ``urlsplit()`` with fewer passes over the string, and returns
+    ``None`` for any other format.
+    """
+    scheme_end = url.find('://')
+    if scheme_end < 1 or not SCHEME_PATTERN.fullmatch(url, 0, scheme_end):
+        return None
+    # Leading/trailing whitespace and control characters, tabs, and newlines are removed by urlsplit
+    if url[-1] <= ' ' or '\t' in url or '\n' in url or '\r' in url:
+        return None
+
+    netloc_start = scheme_end + 3
+    netloc_end = len(url)
+    for delimiter in '/?#':
+        idx = url.find(delimiter, netloc_start, netloc_end)
+        if idx != -1:
+            netloc_end = idx
+    netloc = url[netloc_start:netloc_end]
+    # Netlocs with IPv6 addresses or non-ASCII characters need additional validation
+    if '[' in netloc or ']' in netloc or not netloc.isascii():
+        return None
+
+    path, _, fragment = url[netloc_end:].partition('#')
+    path, _, query = path.partition('?')
+    return url[:scheme_end].lower(), netloc, path, query, fragment
+
+
+def _is_ascii_hostname(host: str) -> bool:
+    """Check if a host is an ASCII hostname with valid label lengths, which doesn't need IDN
+    encoding. Unlike ``idna.encode()``, this doesn't reject characters like underscores, which are
+    not valid in hostnames but are still commonly used.
+    """
+    return (
+        host.isascii()
+        and len(host) <= 253
+        and all(0 < len(label) <= 63 for label in host.split('.'))
+    )
+
+
+def _is_normalized_url(url: str) -> bool:
+    """Check if a URL without a query or fragment is already normalized (the most common case)"""
+    match = CANONICAL_URL_PATTERN.fullmatch(url)
+    if not match or url[-1] == '&':
+        return False
+
+    scheme, host, port, path = match.groups()
+    return (
+        _is_ascii_hostname(host) and port != DEFAULT_PORTS[scheme] and not _has_dot_segments(path)
+    )
+
+
+def _has_dot_segments(path: str) -> bool:
+    """Check if a path contains any segments that would be modified by _remove_dot_segments"""
+    head, _, last_segment = path.rpartition('/')
+    return not path or '//' in path or '.' in head or last_segment in ('.', '..')
+
+
+def _remove_dot_segments(path: str) -> str:
+    """Remove dot-segments and empty segments from a path"""
+    parts = path.split('/')
+    last_idx = len(parts) - 1
+    # Overwrite segments in place, with a write index instead of appending to a new list
+    n_output = 0
+    for idx, part in enumerate(parts):
+        if part == '':
+            if n_output == 0:
+                parts[0] = ''
+                n_output = 1
+        elif part == '..':
+            if n_output > 1:
+                n_output -= 1
+        elif part != '.' and not (idx < last_idx and '.' in part):
+            parts[n_output] = part
+            n_output += 1
+    del parts[n_output:]
+    if part in ('', '.', '..'):
+        parts.append('')
+    return '/'.join(parts)
+
+
+@lru_cache(maxsize=16)
+def _get_safe_pattern(safe: str) -> Pattern:
+    """Get a pattern that matches strings that quote() would leave unchanged"""
+    return re.compile(f'[A-Za-z0-9_.~{re.escape(safe)}-]*')
+
+
+@lru_cache(maxsize=16)
+def _get_quote_table(safe: str) -> List[str]:
+    """Get a lookup table of quoted values for each byte, given a set of safe characters"""
+    safe_bytes = set(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_.-~')
+    safe_bytes.update(safe.encode('ascii', 'ignore'))
+    return [chr(i) if i in safe_bytes else f'%{i:02X}' for i in range(256)]
+
+
+def _quote(value: bytes, safe: str = DEFAULT_SAFE_CHARS) -> str:
+    """Percent-encode bytes; same as ``quote()``, but skips its per-call setup"""
+    quote_table = _get_quote_table(safe)
+    return ''.join([quote_table[b] for b in value])
+
+
 def _requote(value: str, charset: str = 'utf-8', safe: str = DEFAULT_SAFE_CHARS) -> str:
     """Unquote and requote unicode string to normalize.
 
@@ -372,6 +574,29 @@ def _requote(value: str, charset: str = 'utf-8', safe: str = DEFAULT_SAFE_CHARS)
         charset: output encoding
         safe: Safe characters to leave unquoted
     """
-    value = unquote(value)
-    encoded_value = unicodedata.normalize('NFC', value).encode(charset)
-    return quote(encoded_value, safe)
+    # Unquoting is a no-op for strings without escape sequences, and quoting is a no-op for ASCII
+    # strings that only contain safe characters
+    if '%' not in value:
+        if value.isascii() and _get_safe_pattern(safe).fullmatch(value):
+            return value
+    else:
+        value = unquote(value)
+    # NFC normalization is a no-op for ASCII strings
+    if not value.isascii():
+        value = unicodedata.normalize('NFC', value)
+    return _quote(value.encode(charset), safe)
+
+
+def _requote_cached(value: str, safe: str = DEFAULT_SAFE_CHARS) -> str:
+    """Same as :py:func:`_requote`, but with results cached for short values"""
+    # Long values (like large form fields in request bodies) are rarely repeated, and would keep
+    # cache memory unbounded
+    if len(value) > VALUE_CACHE_MAX_LENGTH:
+        return _requote(value, safe=safe)
+    return _requote_short(value, safe)
+
+
+@lru_cache(maxsize=VALUE_CACHE_SIZE)
+def _requote_short(value: str, safe: str = DEFAULT_SAFE_CHARS) -> str:
+    """Cached :py:func:`_requote`; use :py:func:`_requote_cached` instead of calling directly"""
+    return _requote(value, safe=safe)